@@ -1,13 +1,17 @@
-import io
+import hashlib
 import os
 import logging
+from collections import OrderedDict
+from contextlib import AsyncExitStack, asynccontextmanager
 from pathlib import Path
 from typing import Optional
 
 from fastapi import FastAPI, HTTPException, UploadFile, File
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import FileResponse, JSONResponse, Response, StreamingResponse
+from fastapi.responses import FileResponse, ORJSONResponse, Response, StreamingResponse
 from fastapi.staticfiles import StaticFiles
+from starlette.background import BackgroundTask
+from starlette.datastructures import MutableHeaders
 from pydantic import BaseModel, Field
 
 # Load environment variables from a local .env file (if present)
@@ -19,8 +23,10 @@ try:
 except Exception as e:
     logging.getLogger(__name__).warning("Could not load .env automatically: %s", e)
 
+import httpx
+
 # OpenAI SDK (pip install 'openai>=1.40.0')
-from openai import OpenAI, OpenAIError
+from openai import AsyncOpenAI, DefaultAsyncHttpxClient, OpenAIError
 
 # --- Configuration ---
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
@@ -29,12 +35,25 @@ LLM_MODEL = os.getenv("OPENAI_MODEL", "gpt-4o-mini")
 STT_MODEL = os.getenv("STT_MODEL", "gpt-4o-transcribe")  # or "whisper-1"
 TTS_MODEL = os.getenv("TTS_MODEL", "gpt-4o-mini-tts")
 DEFAULT_TTS_VOICE = os.getenv("TTS_VOICE", "alloy")
+# Opt-in in-memory LRU of recent translations (0 disables). Never persisted to disk.
+TRANSLATION_CACHE_SIZE = int(os.getenv("TRANSLATION_CACHE_SIZE", "0"))
+
+# Fixed system prompt for /translate, built once and reused by every request
+TRANSLATE_SYSTEM_PROMPT = (
+    "You are a professional medical translator. "
+    "Translate the user's text into the target language with high fidelity, "
+    "preserving medical terminology accurately. "
+    "Keep the output concise and natural for patient-provider communication. "
+    "Do not add explanations—return only the translation."
+)
+TRANSLATE_SYSTEM_MESSAGE = {"role": "system", "content": TRANSLATE_SYSTEM_PROMPT}
 
-# Lazily create the OpenAI client when needed, so app can start without a key
-_client: Optional[OpenAI] = None
+# Lazily create the OpenAI client when needed, so app can start without a key.
+# One async client (and HTTP/2 connection pool) is shared by all requests.
+_client: Optional[AsyncOpenAI] = None
 
 
-def get_openai_client() -> OpenAI:
+def get_openai_client() -> AsyncOpenAI:
     global _client
     api_key = os.getenv("OPENAI_API_KEY")
     if not api_key:
@@ -43,11 +62,76 @@ def get_openai_client() -> OpenAI:
             detail="OPENAI_API_KEY is not set. Add it to .env or the environment.",
         )
     if _client is None:
-        _client = OpenAI(api_key=api_key, base_url=OPENAI_BASE_URL) if OPENAI_BASE_URL else OpenAI(api_key=api_key)
+        # Start from the SDK's own httpx defaults; only the pool, HTTP/2 and timeouts change
+        http_client = DefaultAsyncHttpxClient(
+            http2=True,
+            limits=httpx.Limits(max_connections=100, max_keepalive_connections=20),
+            timeout=httpx.Timeout(60.0, connect=5.0),
+        )
+        _client = AsyncOpenAI(api_key=api_key, base_url=OPENAI_BASE_URL, http_client=http_client)
     return _client
 
 
-app = FastAPI(title="Healthcare Translation Web App", version="1.0.0")
+_translation_cache: "OrderedDict[str, str]" = OrderedDict()
+
+
+def _translation_cache_key(user_prompt: str) -> str:
+    # Key on the exact prompt sent to the model (it already names the languages),
+    # so a hit can only return the translation of identical input
+    return hashlib.blake2b(user_prompt.encode("utf-8"), digest_size=16).hexdigest()
+
+
+def _get_cached_translation(key: str) -> Optional[str]:
+    translated = _translation_cache.get(key)
+    if translated is not None:
+        _translation_cache.move_to_end(key)
+    return translated
+
+
+def _store_cached_translation(key: str, translated: str) -> None:
+    if TRANSLATION_CACHE_SIZE <= 0:
+        return
+    _translation_cache[key] = translated
+    _translation_cache.move_to_end(key)
+    while len(_translation_cache) > TRANSLATION_CACHE_SIZE:
+        _translation_cache.popitem(last=False)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    global _client
+    yield
+    # Close the shared OpenAI client (and its connection pool) on shutdown
+    if _client is not None:
+        await _client.close()
+        _client = None
+
+
+class NoStoreMiddleware:
+    """Mark every non-static response ``Cache-Control: no-store`` so PHI is not cached downstream."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["path"].startswith("/static"):
+            await self.app(scope, receive, send)
+            return
+
+        async def send_with_no_store(message):
+            if message["type"] == "http.response.start":
+                MutableHeaders(scope=message).setdefault("Cache-Control", "no-store")
+            await send(message)
+
+        await self.app(scope, receive, send_with_no_store)
+
+
+app = FastAPI(
+    title="Healthcare Translation Web App",
+    version="1.0.0",
+    default_response_class=ORJSONResponse,
+    lifespan=lifespan,
+)
 
 # CORS: For prototypes you may allow '*', tighten in production.
 app.add_middleware(
@@ -57,6 +141,7 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+app.add_middleware(NoStoreMiddleware)
 
 # --- Static files ---
 STATIC_DIR = Path(__file__).resolve().parent / "static"
@@ -69,7 +154,7 @@ def root():
     index_path = STATIC_DIR / "index.html"
     if index_path.exists():
         return FileResponse(str(index_path))
-    return JSONResponse(
+    return ORJSONResponse(
         {
             "message": "Healthcare Translation Web App backend is running.",
             "docs": "/docs",
@@ -110,28 +195,29 @@ def health():
 @app.post("/translate", response_model=TranslateResponse)
 async def translate(req: TranslateRequest):
     """Translate text with medical terminology fidelity using the selected LLM."""
-    if not req.text.strip():
+    # Strip once and reuse for the check, the prompt and (via the prompt) the cache key.
+    # Inner newlines are kept so lists and paragraphs keep their layout.
+    text = req.text.strip()
+    if not text:
         raise HTTPException(status_code=400, detail="Empty text")
 
-    try:
-        client = get_openai_client()
-        system = (
-            "You are a professional medical translator. "
-            "Translate the user's text into the target language with high fidelity, "
-            "preserving medical terminology accurately. "
-            "Keep the output concise and natural for patient-provider communication. "
-            "Do not add explanations—return only the translation."
-        )
+    prompt_lines = [f"Target language: {req.target_lang}"]
+    if req.source_lang:
+        prompt_lines.append(f"Source language: {req.source_lang}")
+    prompt_lines.append(f"Text:\n{text}")
+    user_prompt = "\n".join(prompt_lines)
 
-        user_prompt = f"Target language: {req.target_lang}\n"
-        if req.source_lang:
-            user_prompt += f"Source language: {req.source_lang}\n"
-        user_prompt += f"Text:\n{req.text}"
+    cache_key = _translation_cache_key(user_prompt)
+    cached = _get_cached_translation(cache_key)
+    if cached is not None:
+        return TranslateResponse(translated_text=cached, model=LLM_MODEL)
 
-        resp = client.chat.completions.create(
+    try:
+        client = get_openai_client()
+        resp = await client.chat.completions.create(
             model=LLM_MODEL,
             messages=[
-                {"role": "system", "content": system},
+                TRANSLATE_SYSTEM_MESSAGE,
                 {"role": "user", "content": user_prompt},
             ],
             temperature=0.2,
@@ -140,6 +226,7 @@ async def translate(req: TranslateRequest):
         if not translated:
             raise HTTPException(status_code=502, detail="Empty translation from model")
 
+        _store_cached_translation(cache_key, translated)
         return TranslateResponse(translated_text=translated, model=LLM_MODEL)
     except HTTPException:
         raise
@@ -154,13 +241,18 @@ async def stt(file: UploadFile = File(...)):
     """Speech-to-text fallback endpoint. Accepts audio (webm/mp3/wav/ogg) and returns transcript."""
     try:
         client = get_openai_client()
-        data = await file.read()
-        bio = io.BytesIO(data)
-        # Give the BytesIO a name so the SDK can infer format
-        bio.name = file.filename or "audio.webm"
-        result = client.audio.transcriptions.create(
+        # Large uploads are already spooled to disk by Starlette: hand that file to the
+        # SDK so the audio is streamed rather than read into memory. Small uploads are
+        # still in memory, where httpx's fileno() call would roll them over to disk,
+        # so those are read as bytes. The filename lets the API infer the format.
+        if getattr(file.file, "_rolled", True):
+            await file.seek(0)
+            content = file.file
+        else:
+            content = await file.read()
+        result = await client.audio.transcriptions.create(
             model=STT_MODEL,
-            file=bio,
+            file=(file.filename or "audio.webm", content, file.content_type or "audio/webm"),
         )
         text = getattr(result, "text", None) or getattr(result, "output_text", None)
         if not text:
@@ -189,26 +281,44 @@ async def tts(req: TTSRequest):
     try:
         client = get_openai_client()
 
-        # Prefer streaming to avoid buffering large audio in memory
-        stream_ctx = client.audio.speech.with_streaming_response.create(
-            model=TTS_MODEL,
-            voice=voice,
-            input=text,
-            format=fmt,
+        # Prefer streaming to avoid buffering large audio in memory. Open the
+        # upstream response here so OpenAI errors surface before the 200 is sent.
+        stack = AsyncExitStack()
+        resp = await stack.enter_async_context(
+            client.audio.speech.with_streaming_response.create(
+                model=TTS_MODEL,
+                voice=voice,
+                input=text,
+                # OpenAI names the Ogg container by its codec
+                response_format="opus" if fmt == "ogg" else fmt,
+            )
         )
 
-        def iterator():
-            with stream_ctx as resp:
-                for chunk in resp.iter_bytes():
-                    yield chunk
-
-        media_type = {
-            "mp3": "audio/mpeg",
-            "wav": "audio/wav",
-            "ogg": "audio/ogg",
-        }[fmt]
-        headers = {"Content-Disposition": f'inline; filename="speech.{fmt}"'}
-        return StreamingResponse(iterator(), media_type=media_type, headers=headers)
+        try:
+            async def iterator():
+                try:
+                    async for chunk in resp.iter_bytes():
+                        yield chunk
+                finally:
+                    await stack.aclose()
+
+            media_type = {
+                "mp3": "audio/mpeg",
+                "wav": "audio/wav",
+                "ogg": "audio/ogg",
+            }[fmt]
+            headers = {"Content-Disposition": f'inline; filename="speech.{fmt}"'}
+            # The background task also closes the upstream response when the client
+            # disconnects before iteration starts (the generator's finally never runs).
+            return StreamingResponse(
+                iterator(),
+                media_type=media_type,
+                headers=headers,
+                background=BackgroundTask(stack.aclose),
+            )
+        except BaseException:
+            await stack.aclose()
+            raise
     except HTTPException:
         raise
     except OpenAIError as e: